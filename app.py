@@ -1,7 +1,13 @@
 import streamlit as st
-from bot import build_agent
+from bot import build_agent, build_llm
 from langchain_core.messages import AIMessage
 
+# Koneksi LLM di-cache sekali per proses (dipakai bersama semua sesi).
+# Agent-nya sendiri tetap per sesi karena menyimpan memory percakapan.
+@st.cache_resource
+def _get_llm():
+    return build_llm()
+
 # -----------------------------------------------------
 # 1. KONFIGURASI & ASET GAMBAR
 # -----------------------------------------------------
@@ -21,13 +27,13 @@ USER_AVATAR = "🧑‍💻"
 # -----------------------------------------------------
 # 2. CUSTOM CSS (Desain Tampilan)
 # -----------------------------------------------------
-st.markdown("""
+_CSS = """
     <style>
     /* Background Gradasi Hijau - Putih */
     .stApp {
         background: linear-gradient(to bottom, #f0f7f0, #ffffff);
     }
-    
+
     /* Mengatur ukuran Logo di dalam Chat agar pas */
     .stChatMessage .avatar {
         width: 50px !important;
@@ -37,7 +43,9 @@ st.markdown("""
         background-color: transparent !important;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # -----------------------------------------------------
 # 3. SIDEBAR & HEADER
@@ -59,7 +67,7 @@ with st.sidebar:
     )
     if st.button("🗑️ Hapus Riwayat Chat"):
         st.session_state.messages = []
-        st.session_state.agent = build_agent()
+        st.session_state.agent = build_agent(_get_llm())
         st.rerun()
 
 
@@ -78,77 +86,75 @@ st.markdown("---")
 # -----------------------------------------------------
 
 if "agent" not in st.session_state:
-    st.session_state.agent = build_agent()
-    
-agent_executor = st.session_state.agent
+    st.session_state.agent = build_agent(_get_llm())
 
-# Pesan Sambutan (Greeting)
-if "messages" not in st.session_state:
-    st.session_state.messages = [
-        {
-            "role": "assistant", 
-            "content": """
+# Pesan Sambutan (Greeting) - konstanta modul, tidak dibangun ulang per sesi
+_GREETING = """
             **Tabe Salamat!** 🙏
-            
+
             Saya **TINGANG**, Asisten Cerdas.
-            
+
             Saya siap membantu:
             1. 📚 Menjelaskan pelajaran sekolah.
             2. 📰 Memberikan info pendidikan terkini.
-            
+
             Apa yang ingin ditanyakan hari ini?
             """
-        }
-    ]
-
-# -----------------------------------------------------
-# 5. TAMPILAN CHAT
-# -----------------------------------------------------
 
-for message in st.session_state.messages:
-    # Logika Pemilihan Avatar
-    if message["role"] == "assistant":
-        icon_avatar = LOGO_TINGANG_URL # Pakai Logo Katingan
-    else:
-        icon_avatar = USER_AVATAR # Pakai Emoji User
-        
-    with st.chat_message(message["role"], avatar=icon_avatar):
-        st.markdown(message["content"], unsafe_allow_html=True)
+if "messages" not in st.session_state:
+    st.session_state.messages = [{"role": "assistant", "content": _GREETING}]
 
 # -----------------------------------------------------
-# 6. INPUT USER & RESPON
+# 5. TAMPILAN CHAT, INPUT USER & RESPON
 # -----------------------------------------------------
 
-if prompt := st.chat_input("Ketik pertanyaan Anda di sini..."):
-    # Tampilkan Pesan User
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user", avatar=USER_AVATAR):
-        st.markdown(prompt)
-
-    # Proses Jawaban
-    with st.spinner("Sedang mencari informasi..."):
-        full_response = ""
-        # Pastikan Logo Katingan muncul saat sedang mengetik
-        with st.chat_message("assistant", avatar=LOGO_KATINGAN_URL):
-            st_callback = st.empty()
-            
-            try:
+# Fragment: interaksi chat hanya menjalankan ulang blok ini,
+# bukan seluruh script (header, sidebar, dsb.)
+@st.fragment
+def _chat_panel():
+    agent_executor = st.session_state.agent
+
+    for message in st.session_state.messages:
+        # Logika Pemilihan Avatar
+        if message["role"] == "assistant":
+            icon_avatar = LOGO_TINGANG_URL # Pakai Logo Katingan
+        else:
+            icon_avatar = USER_AVATAR # Pakai Emoji User
+
+        with st.chat_message(message["role"], avatar=icon_avatar):
+            st.markdown(message["content"], unsafe_allow_html=True)
+
+    if prompt := st.chat_input("Ketik pertanyaan Anda di sini..."):
+        # Tampilkan Pesan User
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user", avatar=USER_AVATAR):
+            st.markdown(prompt)
+
+        # Proses Jawaban
+        with st.spinner("Sedang mencari informasi..."):
+            # Generator: meneruskan potongan jawaban dari agent ke st.write_stream
+            def _stream_jawaban():
                 for step in agent_executor.stream({"input": prompt}):
                     # Menampilkan indikator alat (tool)
                     if "actions" in step:
                         for action in step["actions"]:
                             st.caption(f"⚙️ *Mengakses data: {action.tool}...*")
-                                                
-                    # Menampilkan teks jawaban
+
+                    # Meneruskan teks jawaban
                     if "output" in step:
-                        full_response += step["output"]
-                        st_callback.markdown(full_response, unsafe_allow_html=True)
+                        yield step["output"]
                     elif isinstance(step, AIMessage):
-                        full_response += step.content
-                        st_callback.markdown(full_response, unsafe_allow_html=True)
-                        
-            except Exception as e:
-                st.error(f"Terjadi kesalahan: {e}")
-
-        # Simpan ke riwayat
-        st.session_state.messages.append({"role": "assistant", "content": full_response})
+                        yield step.content
+
+            full_response = ""
+            # Pastikan Logo Katingan muncul saat sedang mengetik
+            with st.chat_message("assistant", avatar=LOGO_KATINGAN_URL):
+                try:
+                    full_response = st.write_stream(_stream_jawaban())
+                except Exception as e:
+                    st.error(f"Terjadi kesalahan: {e}")
+
+            # Simpan ke riwayat
+            st.session_state.messages.append({"role": "assistant", "content": full_response})
+
+_chat_panel()
@@ -1,12 +1,12 @@
 
-from langchain.agents import agent_types, initialize_agent, AgentType
+from langchain.agents import initialize_agent, AgentType
 from langchain.memory import ConversationBufferMemory
 from langchain_community.llms import Replicate
 from langchain_core.tools import tool
 from langchain_community.utilities import SerpAPIWrapper
 from langchain.tools import Tool
 from dotenv import load_dotenv
-import os
+from functools import lru_cache
 
 # --- TOOLS ---
 
@@ -29,41 +29,61 @@ def kamus_kontekstual(input: str) -> str:
     return f"Jelaskan istilah '{input}' menggunakan analogi sungai/hutan Kalimantan."
 
 # Tool Pencarian Berita (Penting untuk persona baru)
-search = SerpAPIWrapper()
+# Koneksi SerpAPI dibuat saat pertama kali dipakai, bukan saat import,
+# supaya import bot.py cepat dan API key dibaca setelah load_dotenv.
+@lru_cache(maxsize=1)
+def _get_search():
+    load_dotenv()
+    return SerpAPIWrapper()
+
+# Cache hasil pencarian per query agar pertanyaan yang sama
+# tidak memanggil SerpAPI berulang kali dalam satu proses.
+# maxsize membatasi memori pada deployment yang berjalan lama.
+@lru_cache(maxsize=256)
+def _cached_search(query: str) -> str:
+    return _get_search().run(query)
+
 tool_berita_pendidikan = Tool(
     name="cari_info_terkini",
-    func=search.run,
+    func=_cached_search,
     description="WAJIB digunakan untuk mencari BERITA TERBARU, KEBIJAKAN PENDIDIKAN, DATA REAL-TIME, atau HARGA."
 )
 
+# Daftar tool bersifat statis - dibuat sekali di level modul
+_TOOLS = (kalkulator_persen, kamus_kontekstual, tool_berita_pendidikan)
+
 # --- BUILD AGENT ---
 
-def build_agent():
-    load_dotenv()
-    llm = Replicate(model="anthropic/claude-3.5-haiku")
+# SYSTEM PROMPT: Menanamkan Persona Ganda (konstanta modul, tidak
+# dibangun ulang setiap kali agent dibuat)
+_SYSTEM_MESSAGE = """
+Kamu adalah **TINGANG**, AI Agent Pendidikan dari Kalimantan.
+
+**TUGAS UTAMA:**
+1. **Tutor:** Bimbing siswa belajar dengan sabar. Gunakan analogi lokal untuk konsep sulit.
+2. **Reporter Pendidikan:** Berikan informasi TERKINI mengenai kebijakan pendidikan (Kurikulum, BOS, PPG, Beasiswa) dan berita umum.
 
-    # SYSTEM PROMPT: Menanamkan Persona Ganda
-    system_message = """
-    Kamu adalah **TINGANG**, AI Agent Pendidikan dari Kalimantan.
-    
-    **TUGAS UTAMA:**
-    1. **Tutor:** Bimbing siswa belajar dengan sabar. Gunakan analogi lokal untuk konsep sulit.
-    2. **Reporter Pendidikan:** Berikan informasi TERKINI mengenai kebijakan pendidikan (Kurikulum, BOS, PPG, Beasiswa) dan berita umum.
+**PROSEDUR:**
+* Jika user bertanya **"Apa kabar terbaru..."** atau **"Kebijakan baru..."**, kamu WAJIB menggunakan tool `cari_info_terkini`. Jangan jawab pakai hafalan!
+* Jika user bertanya pelajaran, bimbing step-by-step.
+"""
+
+def build_llm():
+    """Membuat koneksi LLM. Dipisah agar bisa di-cache oleh app.py."""
+    load_dotenv()
+    return Replicate(model="anthropic/claude-3.5-haiku")
 
-    **PROSEDUR:**
-    * Jika user bertanya **"Apa kabar terbaru..."** atau **"Kebijakan baru..."**, kamu WAJIB menggunakan tool `cari_info_terkini`. Jangan jawab pakai hafalan!
-    * Jika user bertanya pelajaran, bimbing step-by-step.
-    """
+def build_agent(llm=None):
+    if llm is None:
+        llm = build_llm()
 
     memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-    
-    tools = [kalkulator_persen, kamus_kontekstual, tool_berita_pendidikan]
 
     return initialize_agent(
         llm=llm,
-        tools=tools,
+        tools=list(_TOOLS),
         agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
         memory=memory,
-        agent_kwargs={"system_message": system_message},
+        agent_kwargs={"system_message": _SYSTEM_MESSAGE},
         handle_parsing_errors=True
     )